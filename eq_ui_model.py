@@ -1,295 +1,626 @@
 # eq_ui_model.py
 
+import struct
+import sys
+from array import array
+from dataclasses import InitVar, dataclass, field
+from enum import IntFlag
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter
+from typing import Any, ClassVar, NamedTuple, Optional
+
+# All UI element classes are slotted dataclasses: the generated __init__ assigns every
+# field in a single frame, and there is no per-instance __dict__. eq=False keeps identity
+# semantics (elements are looked up by ScreenID, not by value).
+# Positional arguments follow field order, inherited fields first; fields added for the
+# packed representations (rect, style_flags) and 'item' are keyword-only.
+_ui_class = dataclass(slots=True, repr=False, eq=False)
+
+@_ui_class
 class EQBase:
     """Base class for all EverQuest UI elements, handling common attributes like 'item'."""
-    def __init__(self, item=None):
-        self.item = item
+    item: str = field(default='', kw_only=True)
 
-class EQRGB(EQBase):
+# Little-endian wire formats for handing geometry/colors to a renderer or over IPC
+_RGB_STRUCT = struct.Struct('<4B')  # r, g, b, alpha
+_PAIR_STRUCT = struct.Struct('<2i') # x, y  or  cx, cy
+_RECT_STRUCT = struct.Struct('<4i') # x, y, cx, cy
+
+# Colors, points and sizes are immutable value types: they are created constantly
+# (several per ScreenPiece), so they are plain tuples rather than EQBase objects.
+# To change one, build a new value (or use _replace) and assign it back.
+class EQRGB(NamedTuple):
     """Represents an RGB color with an Alpha channel."""
-    def __init__(self, r=0, g=0, b=0, alpha=255, item=None):
-        super().__init__(item)
-        self.r = r
-        self.g = g
-        self.b = b
-        self.alpha = alpha
+    r: int = 0
+    g: int = 0
+    b: int = 0
+    alpha: int = 255
 
     def __repr__(self):
         return f"RGB(R={self.r}, G={self.g}, B={self.b}, A={self.alpha})"
 
-    def to_tuple(self):
-        return (self.r, self.g, self.b, self.alpha)
+    @staticmethod
+    def of(r, g, b, alpha=255):
+        """Returns a shared EQRGB for these channels; UI files reuse a small palette of colors."""
+        return _interned_rgb(r, g, b, alpha)
 
-class EQPoint(EQBase):
+    def to_tuple(self):
+        return tuple(self)
+
+    def pack(self):
+        """Returns the color as 4 bytes (R, G, B, A)."""
+        return _RGB_STRUCT.pack(*self)
+
+    @property
+    def argb(self):
+        """The color packed into a single 32-bit int as 0xAARRGGBB."""
+        return (self.alpha << 24) | (self.r << 16) | (self.g << 8) | self.b
+
+    @classmethod
+    def from_argb(cls, argb):
+        """Builds a color from a 0xAARRGGBB packed int."""
+        return cls((argb >> 16) & 0xFF, (argb >> 8) & 0xFF, argb & 0xFF, (argb >> 24) & 0xFF)
+
+    def blend(self, other, t_q8):
+        """
+        Linearly blends towards 'other' by t_q8/256 (0 = self, 256 = other).
+        Works on the packed form two channels at a time (A/G and R/B share one multiply each).
+        """
+        inv = 256 - t_q8
+        a = self.argb
+        b = other.argb
+        rb = (((a & 0x00FF00FF) * inv + (b & 0x00FF00FF) * t_q8) >> 8) & 0x00FF00FF
+        ag = (((a >> 8) & 0x00FF00FF) * inv + ((b >> 8) & 0x00FF00FF) * t_q8) & 0xFF00FF00
+        return EQRGB.from_argb(rb | ag)
+
+_interned_rgb = lru_cache(maxsize=512)(EQRGB)
+
+class EQPoint(NamedTuple):
     """Represents a 2D coordinate (X, Y)."""
-    def __init__(self, x=0, y=0, item=None):
-        super().__init__(item)
-        self.x = x
-        self.y = y
+    x: int = 0
+    y: int = 0
 
     def __repr__(self):
         return f"Point(X={self.x}, Y={self.y})"
 
     def to_tuple(self):
-        return (self.x, self.y)
+        return tuple(self)
+
+    def pack(self):
+        """Returns the value as two little-endian int32s."""
+        return _PAIR_STRUCT.pack(*self)
 
-class EQSize(EQBase):
+class EQSize(NamedTuple):
     """Represents dimensions (CX for width, CY for height)."""
-    def __init__(self, cx=0, cy=0, item=None):
-        super().__init__(item)
-        self.cx = cx
-        self.cy = cy
+    cx: int = 0
+    cy: int = 0
 
     def __repr__(self):
         return f"Size(CX={self.cx}, CY={self.cy})"
 
     def to_tuple(self):
-        return (self.cx, self.cy)
+        return tuple(self)
 
+    def pack(self):
+        """Returns the value as two little-endian int32s."""
+        return _PAIR_STRUCT.pack(*self)
+
+class EQRect(NamedTuple):
+    """A piece's position and dimensions in one value (X, Y, CX, CY)."""
+    x: int = 0
+    y: int = 0
+    cx: int = 0
+    cy: int = 0
+
+    def __repr__(self):
+        return f"Rect(X={self.x}, Y={self.y}, CX={self.cx}, CY={self.cy})"
 
+    def to_tuple(self):
+        return tuple(self)
+
+    def pack(self):
+        """Returns the rect as four little-endian int32s."""
+        return _RECT_STRUCT.pack(*self)
+
+# Shared defaults; safe to share because the value types are immutable
+_DEFAULT_WHITE_RGB = EQRGB.of(255, 255, 255, 255)
+_DEFAULT_BLACK_RGB = EQRGB.of(0, 0, 0, 255)
+_DEFAULT_POINT = EQPoint()
+_DEFAULT_SIZE = EQSize()
+_DEFAULT_RECT = EQRect()
+
+# ScreenIDs, EQTypes and short texts repeat heavily across UI files; interning them lets
+# every piece share one string object per distinct value.
+_INTERN_TEXT_MAX_LEN = 64
+
+def intern_ui_string(value, max_len=None):
+    """Returns sys.intern(value) for strings (no longer than max_len, if given), else value unchanged."""
+    if value.__class__ is str and (max_len is None or len(value) <= max_len):
+        return sys.intern(value)
+    return value
+
+class StyleFlag(IntFlag):
+    """Bits of EQControl.style_flags, one per Style_* boolean in SIDL.xml."""
+    V_SCROLL = 1 << 0
+    H_SCROLL = 1 << 1
+    AUTO_V_SCROLL = 1 << 2
+    AUTO_H_SCROLL = 1 << 3
+    TRANSPARENT = 1 << 4
+    TRANSPARENT_CONTROL = 1 << 5
+    BORDER = 1 << 6
+    TOOLTIP = 1 << 7
+    # Window-only styles
+    TITLEBAR = 1 << 8
+    CLOSEBOX = 1 << 9
+    MAXIMIZEBOX = 1 << 10
+    QMARKBOX = 1 << 11
+    MINIMIZEBOX = 1 << 12
+    SIZABLE = 1 << 13
+    SIZABLE_BORDER_TOP = 1 << 14
+    SIZABLE_BORDER_BOTTOM = 1 << 15
+    SIZABLE_BORDER_LEFT = 1 << 16
+    SIZABLE_BORDER_RIGHT = 1 << 17
+    SIZABLE_BORDER_TOP_LEFT = 1 << 18
+    SIZABLE_BORDER_TOP_RIGHT = 1 << 19
+    SIZABLE_BORDER_BOTTOM_LEFT = 1 << 20
+    SIZABLE_BORDER_BOTTOM_RIGHT = 1 << 21
+    CLIENT_MOVABLE = 1 << 22
+
+# style_* attribute name -> flag, in the order the InitVars are declared on each class
+_CONTROL_STYLE_FLAGS = {
+    'style_v_scroll': StyleFlag.V_SCROLL,
+    'style_h_scroll': StyleFlag.H_SCROLL,
+    'style_auto_v_scroll': StyleFlag.AUTO_V_SCROLL,
+    'style_auto_h_scroll': StyleFlag.AUTO_H_SCROLL,
+    'style_transparent': StyleFlag.TRANSPARENT,
+    'style_transparent_control': StyleFlag.TRANSPARENT_CONTROL,
+    'style_border': StyleFlag.BORDER,
+    'style_tooltip': StyleFlag.TOOLTIP,
+}
+_WINDOW_STYLE_FLAGS = {
+    'style_titlebar': StyleFlag.TITLEBAR,
+    'style_closebox': StyleFlag.CLOSEBOX,
+    'style_maximizebox': StyleFlag.MAXIMIZEBOX,
+    'style_qmarkbox': StyleFlag.QMARKBOX,
+    'style_minimizebox': StyleFlag.MINIMIZEBOX,
+    'style_sizable': StyleFlag.SIZABLE,
+    'style_sizable_border_top': StyleFlag.SIZABLE_BORDER_TOP,
+    'style_sizable_border_bottom': StyleFlag.SIZABLE_BORDER_BOTTOM,
+    'style_sizable_border_left': StyleFlag.SIZABLE_BORDER_LEFT,
+    'style_sizable_border_right': StyleFlag.SIZABLE_BORDER_RIGHT,
+    'style_sizable_border_top_left': StyleFlag.SIZABLE_BORDER_TOP_LEFT,
+    'style_sizable_border_top_right': StyleFlag.SIZABLE_BORDER_TOP_RIGHT,
+    'style_sizable_border_bottom_left': StyleFlag.SIZABLE_BORDER_BOTTOM_LEFT,
+    'style_sizable_border_bottom_right': StyleFlag.SIZABLE_BORDER_BOTTOM_RIGHT,
+    'style_client_movable': StyleFlag.CLIENT_MOVABLE,
+}
+
+_SIZABLE_BORDER_FLAGS = (StyleFlag.SIZABLE_BORDER_TOP | StyleFlag.SIZABLE_BORDER_BOTTOM
+                         | StyleFlag.SIZABLE_BORDER_LEFT | StyleFlag.SIZABLE_BORDER_RIGHT
+                         | StyleFlag.SIZABLE_BORDER_TOP_LEFT | StyleFlag.SIZABLE_BORDER_TOP_RIGHT
+                         | StyleFlag.SIZABLE_BORDER_BOTTOM_LEFT | StyleFlag.SIZABLE_BORDER_BOTTOM_RIGHT)
+
+def _install_style_flag_properties(cls, flags_by_name):
+    """Exposes each style_* name on cls as a boolean property backed by a style_flags bit."""
+    for name, flag in flags_by_name.items():
+        flag = int(flag)
+        def getter(self, flag=flag):
+            return bool(self.style_flags & flag)
+        def setter(self, value, flag=flag):
+            if value:
+                self.style_flags |= flag
+            else:
+                self.style_flags &= ~flag
+        setattr(cls, name, property(getter, setter))
+
+
+@_ui_class
 class EQScreenPiece(EQBase):
     """Base class for all visible UI elements, with common position, size, and anchoring."""
-    def __init__(self, screen_id=None, font=3, relative_position=True,
-                 location=None, size=None,
-                 auto_stretch=False, auto_stretch_vertical=False, auto_stretch_horizontal=False,
-                 top_anchor_to_top=True, left_anchor_to_left=True, bottom_anchor_to_top=True, right_anchor_to_left=True,
-                 top_anchor_offset=0, bottom_anchor_offset=0, left_anchor_offset=0, right_anchor_offset=0,
-                 min_v_size=0, min_h_size=0, max_v_size=0, max_h_size=0,
-                 text=None, text_color=None, disabled_color=None,
-                 use_in_layout_horizontal=True, use_in_layout_vertical=True,
-                 background_texture_tint=None, item=None):
-
-        super().__init__(item)
-        self.screen_id = screen_id
-        self.parent_id = None # ADDED: for hierarchy assembly
-        self.font = font
-        self.relative_position = relative_position
-
-        # Initialize complex types as objects if not provided
-        self.location = location if location is not None else EQPoint()
-        self.size = size if size is not None else EQSize()
-        self.text_color = text_color if text_color is not None else EQRGB(r=255, g=255, b=255) # Default white text
-        self.disabled_color = disabled_color if disabled_color is not None else EQRGB() # Default black disabled text
-        self.background_texture_tint = background_texture_tint if background_texture_tint is not None else EQRGB(r=255, g=255, b=255) # Default white tint
-
-        self.auto_stretch = auto_stretch
-        self.auto_stretch_vertical = auto_stretch_vertical
-        self.auto_stretch_horizontal = auto_stretch_horizontal
-        self.top_anchor_to_top = top_anchor_to_top
-        self.left_anchor_to_left = left_anchor_to_left
-        self.bottom_anchor_to_top = bottom_anchor_to_top
-        self.right_anchor_to_left = right_anchor_to_left
-        self.top_anchor_offset = top_anchor_offset
-        self.bottom_anchor_offset = bottom_anchor_offset
-        self.left_anchor_offset = left_anchor_offset
-        self.right_anchor_offset = right_anchor_offset
-        self.min_v_size = min_v_size
-        self.min_h_size = min_h_size
-        self.max_v_size = max_v_size
-        self.max_h_size = max_h_size
-        self.text = text
-        self.use_in_layout_horizontal = use_in_layout_horizontal
-        self.use_in_layout_vertical = use_in_layout_vertical
+    # Fields are declared in the order of the original positional constructor arguments
+    screen_id: Optional[str] = None
+    parent_id: Optional[str] = field(default=None, init=False) # ADDED: for hierarchy assembly
+    font: int = 3
+    relative_position: bool = True
+
+    # Location and size are stored together in 'rect'. The location/size arguments are
+    # still accepted, and are exposed as EQPoint/EQSize properties over the rect.
+    location: InitVar[Optional[EQPoint]] = None
+    size: InitVar[Optional[EQSize]] = None
+    rect: EQRect = field(default=_DEFAULT_RECT, kw_only=True)
+
+    auto_stretch: bool = False
+    auto_stretch_vertical: bool = False
+    auto_stretch_horizontal: bool = False
+    top_anchor_to_top: bool = True
+    left_anchor_to_left: bool = True
+    bottom_anchor_to_top: bool = True
+    right_anchor_to_left: bool = True
+    top_anchor_offset: int = 0
+    bottom_anchor_offset: int = 0
+    left_anchor_offset: int = 0
+    right_anchor_offset: int = 0
+    min_v_size: int = 0
+    min_h_size: int = 0
+    max_v_size: int = 0
+    max_h_size: int = 0
+    text: Optional[str] = None
+
+    # Complex types default to the shared immutable instances
+    text_color: EQRGB = _DEFAULT_WHITE_RGB # Default white text
+    disabled_color: EQRGB = _DEFAULT_BLACK_RGB # Default black disabled text
+    use_in_layout_horizontal: bool = True
+    use_in_layout_vertical: bool = True
+    background_texture_tint: EQRGB = _DEFAULT_WHITE_RGB # Default white tint
+
+    def __post_init__(self, location, size):
+        if location is not None or size is not None:
+            x, y, cx, cy = self.rect
+            if location is not None:
+                x, y = location
+            if size is not None:
+                cx, cy = size
+            self.rect = EQRect(x, y, cx, cy)
+        self.screen_id = intern_ui_string(self.screen_id)
+        self.text = intern_ui_string(self.text, _INTERN_TEXT_MAX_LEN)
 
     def __repr__(self):
         return (f"ScreenPiece(ScreenID='{self.screen_id}', "
                 f"Loc={self.location}, Size={self.size}, Text='{self.text}')")
 
+def _get_location(self):
+    rect = self.rect
+    return EQPoint(rect.x, rect.y)
+
+def _set_location(self, location):
+    x, y = location
+    rect = self.rect
+    self.rect = EQRect(x, y, rect.cx, rect.cy)
+
+def _get_size(self):
+    rect = self.rect
+    return EQSize(rect.cx, rect.cy)
+
+def _set_size(self, size):
+    cx, cy = size
+    rect = self.rect
+    self.rect = EQRect(rect.x, rect.y, cx, cy)
+
+EQScreenPiece.location = property(_get_location, _set_location)
+EQScreenPiece.size = property(_get_size, _set_size)
+
+@_ui_class
 class EQControl(EQScreenPiece):
     """Base class for interactive UI elements, inheriting from ScreenPiece."""
-    def __init__(self, eq_type=None, style_v_scroll=False, style_h_scroll=False,
-                 style_auto_v_scroll=False, style_auto_h_scroll=False,
-                 style_transparent=False, style_transparent_control=False,
-                 style_border=False, style_tooltip=True, tooltip_reference=None,
-                 draw_template=None, layout=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs) # Pass kwargs to the parent (EQScreenPiece) constructor
-        self.eq_type = eq_type
-        self.style_v_scroll = style_v_scroll
-        self.style_h_scroll = style_h_scroll
-        self.style_auto_v_scroll = style_auto_v_scroll
-        self.style_auto_h_scroll = style_auto_h_scroll
-        self.style_transparent = style_transparent
-        self.style_transparent_control = style_transparent_control
-        self.style_border = style_border
-        self.style_tooltip = style_tooltip
-        self.tooltip_reference = tooltip_reference
-        # draw_template and layout would be references to other complex objects
-        self.draw_template = draw_template # Placeholder for now
-        self.layout = layout # Placeholder for now
+    eq_type: Optional[str] = None
+    # All Style_* booleans are packed into style_flags (see StyleFlag), whose default holds the
+    # SIDL defaults. The style_* names are accepted as keyword arguments (set or clear their
+    # bit when passed) and exposed as boolean properties over the bits.
+    style_flags: int = field(default=int(StyleFlag.TOOLTIP), kw_only=True)
+    style_v_scroll: InitVar[Optional[bool]] = None
+    style_h_scroll: InitVar[Optional[bool]] = None
+    style_auto_v_scroll: InitVar[Optional[bool]] = None
+    style_auto_h_scroll: InitVar[Optional[bool]] = None
+    style_transparent: InitVar[Optional[bool]] = None
+    style_transparent_control: InitVar[Optional[bool]] = None
+    style_border: InitVar[Optional[bool]] = None
+    style_tooltip: InitVar[Optional[bool]] = None
+    tooltip_reference: Optional[str] = None
+    # draw_template and layout would be references to other complex objects
+    draw_template: Any = None # Placeholder for now
+    layout: Any = None # Placeholder for now
+
+    _STYLE_FLAG_ORDER: ClassVar[tuple] = tuple(map(int, _CONTROL_STYLE_FLAGS.values()))
+
+    def __post_init__(self, location, size, *style_values):
+        EQScreenPiece.__post_init__(self, location, size)
+        self.eq_type = intern_ui_string(self.eq_type)
+        self.tooltip_reference = intern_ui_string(self.tooltip_reference)
+        flags = self.style_flags
+        for flag, value in zip(self._STYLE_FLAG_ORDER, style_values):
+            if value is not None: # Only the style_* keywords the caller actually passed
+                flags = flags | flag if value else flags & ~flag
+        self.style_flags = flags
 
     def __repr__(self):
         return (f"Control(ScreenID='{self.screen_id}', EQType='{self.eq_type}', "
                 f"Loc={self.location}, Size={self.size})")
 
+_install_style_flag_properties(EQControl, _CONTROL_STYLE_FLAGS)
+
+@_ui_class
 class EQStaticScreenPiece(EQScreenPiece):
     """Base class for non-interactive visual elements."""
-    def __init__(self, auto_draw=True, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.auto_draw = auto_draw
+    auto_draw: bool = True
 
     def __repr__(self):
         return f"StaticScreenPiece(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQStaticText(EQStaticScreenPiece):
     """Represents a static text display."""
-    def __init__(self, no_wrap=False, align_center=False, align_right=False, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.no_wrap = no_wrap
-        self.align_center = align_center
-        self.align_right = align_right
+    no_wrap: bool = False
+    align_center: bool = False
+    align_right: bool = False
 
     def __repr__(self):
         return f"StaticText(ScreenID='{self.screen_id}', Text='{self.text}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQButton(EQControl):
     """Represents a clickable button."""
-    def __init__(self, style_checkbox=False, radio_group=None, text=None,
-                 mouseover_color=None, pressed_color=None,
-                 use_custom_mouseover_color=False, use_custom_disabled_color=False, use_custom_pressed_color=False,
-                 text_align_center=True, text_align_right=False, text_align_v_center=True,
-                 text_offset_x=0, text_offset_y=0,
-                 button_draw_template=None, template=None, # template is likely an alias or for named templates
-                 sound_pressed=None, sound_up=None, sound_flyby=None,
-                 decal_offset=None, decal_size=None,
-                 item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.style_checkbox = style_checkbox
-        self.radio_group = radio_group
-        self.text = text
-        self.mouseover_color = mouseover_color if mouseover_color is not None else EQRGB()
-        self.pressed_color = pressed_color if pressed_color is not None else EQRGB()
-        self.use_custom_mouseover_color = use_custom_mouseover_color
-        self.use_custom_disabled_color = use_custom_disabled_color
-        self.use_custom_pressed_color = use_custom_pressed_color
-        self.text_align_center = text_align_center
-        self.text_align_right = text_align_right
-        self.text_align_v_center = text_align_v_center
-        self.text_offset_x = text_offset_x
-        self.text_offset_y = text_offset_y
-        self.button_draw_template = button_draw_template # Placeholder for DrawTemplate object
-        self.template = template # Placeholder for DrawTemplate object (for named templates)
-        self.sound_pressed = sound_pressed
-        self.sound_up = sound_up
-        self.sound_flyby = sound_flyby
-        self.decal_offset = decal_offset if decal_offset is not None else EQPoint()
-        self.decal_size = decal_size if decal_size is not None else EQSize()
+    style_checkbox: bool = False
+    radio_group: Optional[str] = None
+    mouseover_color: EQRGB = _DEFAULT_BLACK_RGB
+    pressed_color: EQRGB = _DEFAULT_BLACK_RGB
+    use_custom_mouseover_color: bool = False
+    use_custom_disabled_color: bool = False
+    use_custom_pressed_color: bool = False
+    text_align_center: bool = True
+    text_align_right: bool = False
+    text_align_v_center: bool = True
+    text_offset_x: int = 0
+    text_offset_y: int = 0
+    button_draw_template: Any = None # Placeholder for DrawTemplate object
+    template: Any = None # Placeholder for DrawTemplate object (for named templates)
+    sound_pressed: Optional[str] = None
+    sound_up: Optional[str] = None
+    sound_flyby: Optional[str] = None
+    decal_offset: EQPoint = _DEFAULT_POINT
+    decal_size: EQSize = _DEFAULT_SIZE
 
     def __repr__(self):
         return f"Button(ScreenID='{self.screen_id}', Text='{self.text}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQGauge(EQControl):
     """Represents a progress bar or gauge."""
-    def __init__(self, gauge_draw_template=None, fill_tint=None,
-                 draw_lines_fill=False, lines_fill_tint=None,
-                 text_offset_x=0, text_offset_y=0,
-                 gauge_offset_x=0, gauge_offset_y=16,
-                 item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.gauge_draw_template = gauge_draw_template # Placeholder for DrawTemplate object
-        self.fill_tint = fill_tint if fill_tint is not None else EQRGB()
-        self.draw_lines_fill = draw_lines_fill
-        self.lines_fill_tint = lines_fill_tint if lines_fill_tint is not None else EQRGB()
-        self.text_offset_x = text_offset_x
-        self.text_offset_y = text_offset_y
-        self.gauge_offset_x = gauge_offset_x
-        self.gauge_offset_y = gauge_offset_y
+    gauge_draw_template: Any = None # Placeholder for DrawTemplate object
+    fill_tint: EQRGB = _DEFAULT_BLACK_RGB
+    draw_lines_fill: bool = False
+    lines_fill_tint: EQRGB = _DEFAULT_BLACK_RGB
+    text_offset_x: int = 0
+    text_offset_y: int = 0
+    gauge_offset_x: int = 0
+    gauge_offset_y: int = 16
 
     def __repr__(self):
         return f"Gauge(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQLabel(EQControl):
     """Represents a display label, often for dynamic text."""
-    def __init__(self, no_wrap=False, align_center=False, align_right=False,
-                 resize_height_to_text=False, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.no_wrap = no_wrap
-        self.align_center = align_center
-        self.align_right = align_right
-        self.resize_height_to_text = resize_height_to_text
+    no_wrap: bool = False
+    align_center: bool = False
+    align_right: bool = False
+    resize_height_to_text: bool = False
 
     def __repr__(self):
         return f"Label(ScreenID='{self.screen_id}', Text='{self.text}', Loc={self.location}, Size={self.size})"
 
+# Columns of EQWindow.piece_geometry(). Most are read with one C-level attrgetter per piece
+# (column name -> attribute path); the rest are computed per piece.
+_PIECE_GEOMETRY_PATHS = {
+    'x': 'rect.x',
+    'y': 'rect.y',
+    'cx': 'rect.cx',
+    'cy': 'rect.cy',
+    'top_anchor_offset': 'top_anchor_offset',
+    'bottom_anchor_offset': 'bottom_anchor_offset',
+    'left_anchor_offset': 'left_anchor_offset',
+    'right_anchor_offset': 'right_anchor_offset',
+    'min_h_size': 'min_h_size',
+    'max_h_size': 'max_h_size',
+    'min_v_size': 'min_v_size',
+    'max_v_size': 'max_v_size',
+}
+_PIECE_GEOMETRY_COMPUTED = {
+    'style_flags': lambda p: getattr(p, 'style_flags', 0), # Static pieces have no style flags
+    'anchor_bits': lambda p: _anchor_bits(p),
+}
+_PIECE_GEOMETRY_COLUMNS = (*_PIECE_GEOMETRY_PATHS, *_PIECE_GEOMETRY_COMPUTED)
+
+def _anchor_bits(piece):
+    """Packs a piece's anchoring/stretch booleans into a small int (the anchor_bits of _solve_rect)."""
+    return (piece.top_anchor_to_top
+            | piece.left_anchor_to_left << 1
+            | piece.bottom_anchor_to_top << 2
+            | piece.right_anchor_to_left << 3
+            | piece.auto_stretch << 4
+            | piece.auto_stretch_horizontal << 5
+            | piece.auto_stretch_vertical << 6)
+
+def _solve_rect(x, y, cx, cy, anchor_bits,
+                top_anchor_offset, bottom_anchor_offset, left_anchor_offset, right_anchor_offset,
+                min_h_size, max_h_size, min_v_size, max_v_size, parent_cx, parent_cy):
+    """
+    Resolves a child's (x, y, cx, cy) relative to its parent's client area from plain ints.
+    Stretched axes are placed from the anchor offsets (measured from the parent's
+    left/top edge or right/bottom edge); other axes use Location/Size as-is.
+    Non-zero min/max sizes clamp the result.
+    """
+    if anchor_bits & 0x30: # AutoStretch or AutoStretchHorizontal
+        left = left_anchor_offset if anchor_bits & 0x02 else parent_cx - left_anchor_offset
+        right = right_anchor_offset if anchor_bits & 0x08 else parent_cx - right_anchor_offset
+        x, cx = left, right - left
+    if anchor_bits & 0x50: # AutoStretch or AutoStretchVertical
+        top = top_anchor_offset if anchor_bits & 0x01 else parent_cy - top_anchor_offset
+        bottom = bottom_anchor_offset if anchor_bits & 0x04 else parent_cy - bottom_anchor_offset
+        y, cy = top, bottom - top
+    if min_h_size and cx < min_h_size: cx = min_h_size
+    if max_h_size and cx > max_h_size: cx = max_h_size
+    if min_v_size and cy < min_v_size: cy = min_v_size
+    if max_v_size and cy > max_v_size: cy = max_v_size
+    return (x, y, cx, cy)
+
+def _solve_piece_rect(piece, parent_cx, parent_cy):
+    """Resolves one piece's parent-relative rect (see _solve_rect)."""
+    x, y, cx, cy = piece.rect
+    return _solve_rect(x, y, cx, cy, _anchor_bits(piece),
+                       piece.top_anchor_offset, piece.bottom_anchor_offset,
+                       piece.left_anchor_offset, piece.right_anchor_offset,
+                       piece.min_h_size, piece.max_h_size, piece.min_v_size, piece.max_v_size,
+                       parent_cx, parent_cy)
+
+@_ui_class
 class EQWindow(EQControl): # SIDL.xml calls this 'Screen' but we'll use Window for clarity
     """Represents a top-level EverQuest UI window."""
-    def __init__(self, style_titlebar=False, style_closebox=False, style_maximizebox=False,
-                 style_qmarkbox=False, style_minimizebox=False, style_sizable=False,
-                 style_sizable_border_top=True, style_sizable_border_bottom=True,
-                 style_sizable_border_left=True, style_sizable_border_right=True,
-                 style_sizable_border_top_left=True, style_sizable_border_top_right=True,
-                 style_sizable_border_bottom_left=True, style_sizable_border_bottom_right=True,
-                 style_client_movable=False, escapable=True, item=None, **kwargs):
-        super().__init__(item=item, **kwargs) # Pass kwargs to the parent (EQControl) constructor
-        self.style_titlebar = style_titlebar
-        self.style_closebox = style_closebox
-        self.style_maximizebox = style_maximizebox
-        self.style_qmarkbox = style_qmarkbox
-        self.style_minimizebox = style_minimizebox
-        self.style_sizable = style_sizable
-        self.style_sizable_border_top = style_sizable_border_top
-        self.style_sizable_border_bottom = style_sizable_border_bottom
-        self.style_sizable_border_left = style_sizable_border_left
-        self.style_sizable_border_right = style_sizable_border_right
-        self.style_sizable_border_top_left = style_sizable_border_top_left
-        self.style_sizable_border_top_right = style_sizable_border_top_right
-        self.style_sizable_border_bottom_left = style_sizable_border_bottom_left
-        self.style_sizable_border_bottom_right = style_sizable_border_bottom_right
-        self.style_client_movable = style_client_movable
-        self.escapable = escapable
-        self.pieces = [] # A list to hold child ScreenPiece objects
-        self.raw_pieces_references = [] # Store raw string references
+    style_flags: int = field(default=int(StyleFlag.TOOLTIP | _SIZABLE_BORDER_FLAGS), kw_only=True) # SIDL defaults for Screen
+    style_titlebar: InitVar[Optional[bool]] = None
+    style_closebox: InitVar[Optional[bool]] = None
+    style_maximizebox: InitVar[Optional[bool]] = None
+    style_qmarkbox: InitVar[Optional[bool]] = None
+    style_minimizebox: InitVar[Optional[bool]] = None
+    style_sizable: InitVar[Optional[bool]] = None
+    style_sizable_border_top: InitVar[Optional[bool]] = None
+    style_sizable_border_bottom: InitVar[Optional[bool]] = None
+    style_sizable_border_left: InitVar[Optional[bool]] = None
+    style_sizable_border_right: InitVar[Optional[bool]] = None
+    style_sizable_border_top_left: InitVar[Optional[bool]] = None
+    style_sizable_border_top_right: InitVar[Optional[bool]] = None
+    style_sizable_border_bottom_left: InitVar[Optional[bool]] = None
+    style_sizable_border_bottom_right: InitVar[Optional[bool]] = None
+    style_client_movable: InitVar[Optional[bool]] = None
+    escapable: bool = True
+    pieces: list = field(default_factory=list, init=False) # A list to hold child ScreenPiece objects
+    raw_pieces_references: list = field(default_factory=list, init=False) # Store raw string references
+
+    _STYLE_FLAG_ORDER: ClassVar[tuple] = EQControl._STYLE_FLAG_ORDER + tuple(map(int, _WINDOW_STYLE_FLAGS.values()))
 
     def __repr__(self):
         return (f"Window(ScreenID='{self.screen_id}', "
                 f"Loc={self.location}, Size={self.size}, "
                 f"Children={len(self.pieces)} pieces)")
 
+    def piece_geometry(self, columns=_PIECE_GEOMETRY_COLUMNS):
+        """
+        Returns the numeric geometry of self.pieces as a structure of arrays: a dict mapping
+        each requested column name ('x', 'y', 'cx', 'cy', anchor offsets, min/max sizes, style
+        and anchor bits; all of them by default) to an array('i') indexed like self.pieces.
+        Layout passes can scan these flat columns instead of chasing piece -> rect -> x for
+        every child; ask only for the columns the pass reads.
+
+        The columns are built from the pieces on every call (nothing is cached, so they
+        are never stale). Raises KeyError for an unknown column name.
+        """
+        pieces = self.pieces
+        geometry = {}
+        read_names = [name for name in columns if name in _PIECE_GEOMETRY_PATHS]
+        if read_names:
+            # One pass over the pieces reads every attribute column, then rows are split into columns
+            rows = map(attrgetter(*[_PIECE_GEOMETRY_PATHS[name] for name in read_names]), pieces)
+            if len(read_names) == 1:
+                geometry[read_names[0]] = array('i', rows)
+            else:
+                column_values = zip(*rows) if pieces else [()] * len(read_names)
+                geometry.update(zip(read_names, map(array, repeat('i'), column_values)))
+        for name in columns:
+            if name not in geometry:
+                geometry[name] = array('i', map(_PIECE_GEOMETRY_COMPUTED[name], pieces))
+        return {name: geometry[name] for name in columns}
+
+    def write_back_geometry(self, geometry):
+        """
+        Copies the x/y/cx/cy columns of 'geometry' (from piece_geometry(), edited in place by a
+        layout pass) back into each piece's rect.
+        """
+        for piece, x, y, cx, cy in zip(self.pieces, geometry['x'], geometry['y'], geometry['cx'], geometry['cy']):
+            if piece.rect != (x, y, cx, cy):
+                piece.rect = EQRect(x, y, cx, cy)
+
+    def shift_pieces(self, dx, dy):
+        """Moves every piece by (dx, dy)."""
+        for piece in self.pieces:
+            x, y, cx, cy = piece.rect
+            piece.rect = EQRect(x + dx, y + dy, cx, cy)
+
+    def solve_piece_geometry(self):
+        """
+        Solves every piece's parent-relative rect in one pass over self.pieces, reading each
+        piece's rect and anchoring directly. Returns a dict of array('i') columns 'x', 'y',
+        'cx', 'cy' indexed like self.pieces.
+        Unlike layout_pieces(), window position is not applied.
+        """
+        pieces = self.pieces
+        count = len(pieces)
+        _, _, parent_cx, parent_cy = self.rect
+        solved = map(_solve_piece_rect, pieces, repeat(parent_cx, count), repeat(parent_cy, count))
+        xs, ys, cxs, cys = zip(*solved) if count else ((), (), (), ())
+        return {'x': array('i', xs), 'y': array('i', ys), 'cx': array('i', cxs), 'cy': array('i', cys)}
+
+    def pack_geometry(self):
+        """
+        Returns the rects of self.pieces packed back to back as little-endian int32
+        (x, y, cx, cy), 16 bytes per piece, in the same order as self.pieces.
+        """
+        pieces = self.pieces
+        size = _RECT_STRUCT.size
+        buffer = bytearray(size * len(pieces))
+        pack_into = _RECT_STRUCT.pack_into
+        for offset, piece in zip(range(0, len(buffer), size), pieces):
+            pack_into(buffer, offset, *piece.rect)
+        return bytes(buffer)
+
+    def piece_rect(self, piece):
+        """
+        Returns the (x, y, cx, cy) screen rect of one of this window's pieces.
+        The solve is a handful of integer operations, so it is not cached: the result
+        always reflects the current piece and window.
+        """
+        window_x, window_y, parent_cx, parent_cy = self.rect
+        rect = _solve_piece_rect(piece, parent_cx, parent_cy)
+        if not piece.relative_position:
+            return rect
+        x, y, cx, cy = rect
+        return (x + window_x, y + window_y, cx, cy)
+
+    def layout_pieces(self):
+        """Returns the screen rects of all pieces, in the same order as self.pieces."""
+        return [self.piece_rect(piece) for piece in self.pieces]
+
+_install_style_flag_properties(EQWindow, _WINDOW_STYLE_FLAGS)
+
+@_ui_class
 class EQStaticAnimation(EQStaticScreenPiece):
     """Represents a static animation, typically for background images or visual effects."""
-    def __init__(self, animation=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.animation = animation # Placeholder for Ui2DAnimation object
+    animation: Any = None # Placeholder for Ui2DAnimation object
 
     def __repr__(self):
         return f"StaticAnimation(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQInvSlot(EQControl):
     """Represents an inventory slot."""
-    def __init__(self, background=None, item_offset_x=0, item_offset_y=0, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.background = background # Placeholder for Ui2DAnimation object
-        self.item_offset_x = item_offset_x
-        self.item_offset_y = item_offset_y
+    background: Any = None # Placeholder for Ui2DAnimation object
+    item_offset_x: int = 0
+    item_offset_y: int = 0
 
     def __repr__(self):
         return f"InvSlot(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQTilesLayoutBox(EQControl): # TileLayoutBox in XML
     """A layout box that tiles children."""
-    def __init__(self, spacing=5, secondary_spacing=5, horizontal_first=True,
-                 anchor_to_top=True, anchor_to_left=True, first_piece_template=False,
-                 snap_to_children=False, pieces=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.spacing = spacing
-        self.secondary_spacing = secondary_spacing
-        self.horizontal_first = horizontal_first
-        self.anchor_to_top = anchor_to_top
-        self.anchor_to_left = anchor_to_left
-        self.first_piece_template = first_piece_template
-        self.snap_to_children = snap_to_children
-        self.pieces = pieces if pieces is not None else [] # Will store list of ScreenID strings for now
-        self.raw_pieces_references = [] # Store raw string references
+    spacing: int = 5
+    secondary_spacing: int = 5
+    horizontal_first: bool = True
+    anchor_to_top: bool = True
+    anchor_to_left: bool = True
+    first_piece_template: bool = False
+    snap_to_children: bool = False
+    pieces: list = field(default_factory=list) # Will store list of ScreenID strings for now
+    raw_pieces_references: list = field(default_factory=list, init=False) # Store raw string references
 
     def __repr__(self):
         return (f"TileLayoutBox(ScreenID='{self.screen_id}', Loc={self.location}, "
                 f"Size={self.size}, ChildrenRefs={len(self.pieces)})")
 
+@_ui_class
 class EQListBox(EQControl): # Listbox in XML
     """A listbox control."""
-    def __init__(self, owner_draw=False, columns=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.owner_draw = owner_draw
-        self.columns = columns if columns is not None else [] # Will store list of Column objects
+    owner_draw: bool = False
+    columns: list = field(default_factory=list) # Will store list of Column objects
 
     def __repr__(self):
         return f"Listbox(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
@@ -297,77 +628,51 @@ class EQListBox(EQControl): # Listbox in XML
 # You would also need EQListboxColumn to represent columns for Listbox if you want full parsing
 # class EQListboxColumn(EQBase): ...
 
+@_ui_class
 class EQSTMLbox(EQControl): # STMLbox in XML
     """A static multi-line text box."""
-    def __init__(self, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
 
     def __repr__(self):
         return f"STMLbox(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
 
+@_ui_class
 class EQVerticalLayoutBox(EQControl): # VerticalLayoutBox in XML
     """A layout box that stacks children vertically."""
-    def __init__(self, spacing=5, style_dividors=True, pieces=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.spacing = spacing
-        self.style_dividors = style_dividors
-        self.pieces = pieces if pieces is not None else [] # Will store list of ScreenID strings for now
-        self.raw_pieces_references = [] # Store raw string references
+    spacing: int = 5
+    style_dividors: bool = True
+    pieces: list = field(default_factory=list) # Will store list of ScreenID strings for now
+    raw_pieces_references: list = field(default_factory=list, init=False) # Store raw string references
 
     def __repr__(self):
         return (f"VerticalLayoutBox(ScreenID='{self.screen_id}', Loc={self.location}, "
                 f"Size={self.size}, ChildrenRefs={len(self.pieces)})")
 
+@_ui_class
 class EQPage(EQControl): # Page in XML
     """A page within a TabBox."""
-    def __init__(self, tab_text=None, tab_text_color=None, tab_text_active_color=None,
-                 tab_icon=None, tab_icon_active=None, pieces=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.tab_text = tab_text
-        self.tab_text_color = tab_text_color if tab_text_color is not None else EQRGB()
-        self.tab_text_active_color = tab_text_active_color if tab_text_active_color is not None else EQRGB()
-        self.tab_icon = tab_icon # Placeholder for Ui2DAnimation
-        self.tab_icon_active = tab_icon_active # Placeholder for Ui2DAnimation
-        self.pieces = pieces if pieces is not None else [] # Will store list of ScreenID strings for now
-        self.raw_pieces_references = [] # Store raw string references
+    tab_text: Optional[str] = None
+    tab_text_color: EQRGB = _DEFAULT_BLACK_RGB
+    tab_text_active_color: EQRGB = _DEFAULT_BLACK_RGB
+    tab_icon: Any = None # Placeholder for Ui2DAnimation
+    tab_icon_active: Any = None # Placeholder for Ui2DAnimation
+    pieces: list = field(default_factory=list) # Will store list of ScreenID strings for now
+    raw_pieces_references: list = field(default_factory=list, init=False) # Store raw string references
 
     def __repr__(self):
         return (f"Page(ScreenID='{self.screen_id}', TabText='{self.tab_text}', "
                 f"Loc={self.location}, Size={self.size}, ChildrenRefs={len(self.pieces)})")
 
+@_ui_class
 class EQTabBox(EQControl): # TabBox in XML
     """A container for multiple pages."""
-    def __init__(self, show_tabs=True, tab_border_template=None, tab_style=0, tab_width=0,
-                 page_border_template=None, pages=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.show_tabs = show_tabs
-        self.tab_border_template = tab_border_template # Placeholder for FrameTemplate
-        self.tab_style = tab_style
-        self.tab_width = tab_width
-        self.page_border_template = page_border_template # Placeholder for FrameTemplate
-        self.pages = pages if pages is not None else [] # Will store list of Page:item strings for now
-        self.raw_pages_references = [] # Store raw string references
+    show_tabs: bool = True
+    tab_border_template: Any = None # Placeholder for FrameTemplate
+    tab_style: int = 0
+    tab_width: int = 0
+    page_border_template: Any = None # Placeholder for FrameTemplate
+    pages: list = field(default_factory=list) # Will store list of Page:item strings for now
+    raw_pages_references: list = field(default_factory=list, init=False) # Store raw string references
 
     def __repr__(self):
         return (f"TabBox(ScreenID='{self.screen_id}', Loc={self.location}, "
                 f"Size={self.size}, Pages={len(self.pages)})")
-
-class EQStaticAnimation(EQStaticScreenPiece):
-    """Represents a static animation, typically for background images or visual effects."""
-    def __init__(self, animation=None, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.animation = animation # Placeholder for Ui2DAnimation object
-
-    def __repr__(self):
-        return f"StaticAnimation(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
-
-class EQInvSlot(EQControl):
-    """Represents an inventory slot."""
-    def __init__(self, background=None, item_offset_x=0, item_offset_y=0, item=None, **kwargs):
-        super().__init__(item=item, **kwargs)
-        self.background = background # Placeholder for Ui2DAnimation object
-        self.item_offset_x = item_offset_x
-        self.item_offset_y = item_offset_y
-
-    def __repr__(self):
-        return f"InvSlot(ScreenID='{self.screen_id}', Loc={self.location}, Size={self.size})"
@@ -1,9 +1,36 @@
 # eq_ui_parser.py
 
-print("EQidle parser script started!") # This line confirms script execution
-
-import xml.etree.ElementTree as ET
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from functools import partial
+
+# lxml does tokenizing and tree building in libxml2 and is noticeably faster on large
+# UI files; the stdlib ElementTree has the same API and is used when lxml is missing.
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+# ElementTree silently falls back to its pure-Python implementation (e.g. on PyPy) when
+# the _elementtree C accelerator is unavailable; that is many times slower, so note it.
+try:
+    import _elementtree
+    C_ELEMENTTREE = ET.XMLParser is _elementtree.XMLParser
+except ImportError:
+    C_ELEMENTTREE = False
 from eq_ui_model import *
+from eq_ui_model import _INTERN_TEXT_MAX_LEN
+
+logger = logging.getLogger(__name__)
+if not HAVE_LXML and not C_ELEMENTTREE:
+    logger.warning("lxml and the C ElementTree accelerator are unavailable; XML parsing will be slow.")
 
 # A mapping from XML tag names to our Python class names
 # You will expand this mapping as you add more classes to eq_ui_model.py
@@ -24,244 +51,590 @@ EQ_ELEMENT_CLASSES = {
     # Add more as you define them in eq_ui_model.py
 }
 
+# UI files are small enough to read in one go; the bytes are then fed to the parser in
+# slices so events can still be handled (and subtrees freed) while parsing.
+_FEED_CHUNK_SIZE = 64 * 1024
+
+def _iter_xml_events(xml_filepath):
+    """
+    Yields ('start' | 'end', element) events for xml_filepath, like ET.iterparse.
+    The file is read with a single read() and fed to an XMLPullParser.
+    With lxml, whitespace-only text, comments and processing instructions are dropped while
+    parsing so the tree walk never sees them (the stdlib parser already skips both).
+    """
+    with open(xml_filepath, 'rb') as xml_file:
+        data = xml_file.read()
+    if HAVE_LXML:
+        parser = ET.XMLPullParser(events=("start", "end"), remove_blank_text=True, remove_comments=True, remove_pis=True)
+    else:
+        parser = ET.XMLPullParser(events=("start", "end"))
+    # Slicing a memoryview hands the parser each chunk without copying it. lxml's feed()
+    # only accepts bytes/str, so it gets (copied) bytes slices.
+    buffer = data if HAVE_LXML else memoryview(data)
+    for offset in range(0, len(data), _FEED_CHUNK_SIZE):
+        parser.feed(buffer[offset:offset + _FEED_CHUNK_SIZE])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
 def parse_eq_ui_xml(xml_filepath):
     """
     Parses an EverQuest UI XML file and returns a list of parsed EQ UI objects.
     An EQ UI file can contain multiple top-level elements like Screen, Gauge, etc.
+    The file is streamed: each top-level element is parsed as soon as it is complete
+    and then removed from the tree, so only one element subtree is held at a time.
     """
     parsed_elements = []
     try:
-        tree = ET.parse(xml_filepath)
-        root = tree.getroot()
-        print(f"DEBUG: Root element found: <{root.tag}>") # Debug line
+        context = _iter_xml_events(xml_filepath)
+        _, root = next(context)
+        logger.debug("Root element found: <%s>", root.tag)
 
         # The common root for EQ UI files is <XML>
         if root.tag == "XML":
-            print(f"DEBUG: Root is <XML>. Iterating through its children.") # Debug line
-            for xml_element in root:
-                print(f"DEBUG: Child of <XML> root: <{xml_element.tag}>") # Debug line
+            logger.debug("Root is <XML>. Iterating through its children.")
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            depth = 1
+            get_class = EQ_ELEMENT_CLASSES.get
+            append_element = parsed_elements.append
+            for event, xml_element in context:
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1: # Only act when a direct child of <XML> is complete
+                    continue
+                if debug_enabled:
+                    logger.debug("Child of <XML> root: <%s>", xml_element.tag)
                 # Check if the child tag is one of our known EQ UI element types
-                eq_class = EQ_ELEMENT_CLASSES.get(xml_element.tag)
+                eq_class = get_class(xml_element.tag)
                 if eq_class:
                     eq_object = eq_class() # Create an instance of the corresponding class
                     parse_element_properties(xml_element, eq_object) # Parse its properties
-                    parsed_elements.append(eq_object)
+                    append_element(eq_object)
                 else:
-                    print(f"Warning: Unknown top-level element tag '{xml_element.tag}' in {xml_filepath}. Skipping.")
+                    logger.warning("Unknown top-level element tag '%s' in %s. Skipping.", xml_element.tag, xml_filepath)
+                # Done with this subtree; drop it so memory stays flat on large files
+                xml_element.clear()
+                root.remove(xml_element)
         elif root.tag in EQ_ELEMENT_CLASSES: # Handle cases where root might directly be a Screen or other element
-            print(f"DEBUG: Root is a recognized UI element: <{root.tag}>") # Debug line
+            logger.debug("Root is a recognized UI element: <%s>", root.tag)
+            for _ in context: # Let the whole root element finish parsing
+                pass
             eq_class = EQ_ELEMENT_CLASSES.get(root.tag)
             eq_object = eq_class()
             parse_element_properties(root, eq_object)
             parsed_elements.append(eq_object)
         else:
-            print(f"Error: Unexpected root element '{root.tag}' in {xml_filepath}. Expected 'XML' or a defined UI element.")
+            logger.error("Unexpected root element '%s' in %s. Expected 'XML' or a defined UI element.", root.tag, xml_filepath)
 
-        print(f"DEBUG: Finished parsing. Found {len(parsed_elements)} top-level elements.") # Debug line
+        logger.debug("Finished parsing. Found %d top-level elements.", len(parsed_elements))
         return parsed_elements
 
     except FileNotFoundError:
-        print(f"Error: File not found: {xml_filepath}")
+        logger.error("File not found: %s", xml_filepath)
+        return []
+    except OSError as e:
+        logger.error("Could not read %s: %s", xml_filepath, e)
         return []
     except ET.ParseError as e:
-        print(f"Error parsing XML in {xml_filepath}: {e}")
+        logger.error("Error parsing XML in %s: %s", xml_filepath, e)
+        return []
+    except ValueError as e: # A numeric attribute or element held something that is not a number
+        logger.error("Invalid value in %s: %s", xml_filepath, e)
+        return []
+    # Anything else is a bug in the parser and propagates with its traceback
+
+
+# Parsed results are cached on disk as pickles keyed by the file's path, mtime and size.
+# Bump _PARSE_CACHE_VERSION whenever the model or parser changes what a parse produces.
+_PARSE_CACHE_VERSION = 2
+
+def _default_cache_dir():
+    """Returns the per-user cache directory (never a shared location such as the temp dir)."""
+    base = (os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'eqidle')
+
+def _parse_cache_path(xml_filepath, cache_dir):
+    path_hash = hashlib.blake2b(os.path.abspath(xml_filepath).encode(), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"eqidle_ui_{path_hash}.pkl")
+
+def _is_trusted_cache_file(cache_file):
+    """
+    Unpickling runs arbitrary code, so only cache files owned by the current user and
+    not writable by group/others are loaded. (No ownership model to check on Windows.)
+    """
+    if not hasattr(os, 'getuid'):
+        return True
+    stat = os.fstat(cache_file.fileno())
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+def load_eq_ui_xml(xml_filepath, cache_dir=None):
+    """
+    Like parse_eq_ui_xml, but reuses a pickled result from a previous parse while the
+    file is unchanged (same mtime and size). cache_dir defaults to a per-user directory
+    (see _default_cache_dir), created with mode 0700 if missing.
+    A missing, stale, untrusted or unreadable cache entry just falls back to parsing.
+    """
+    try:
+        stat = os.stat(xml_filepath)
+    except FileNotFoundError:
+        logger.error("File not found: %s", xml_filepath)
         return []
-    except Exception as e: # Broader catch for unexpected errors during parsing logic
-        print(f"An unexpected error occurred during XML parsing: {e}")
-        import traceback
-        traceback.print_exc()
+    except OSError as e: # Same as parse_eq_ui_xml: one unreadable path must not abort a batch
+        logger.error("Could not read %s: %s", xml_filepath, e)
         return []
+    stamp = (_PARSE_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache_dir = cache_dir or _default_cache_dir()
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    except OSError as e:
+        logger.warning("Could not create parse cache directory %s: %s", cache_dir, e)
+        return parse_eq_ui_xml(xml_filepath)
+    cache_path = _parse_cache_path(xml_filepath, cache_dir)
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            if not _is_trusted_cache_file(cache_file):
+                logger.warning("Ignoring parse cache %s: not owned by this user or writable by others", cache_path)
+            else:
+                cached_stamp, parsed_elements = pickle.load(cache_file)
+                if cached_stamp == stamp:
+                    logger.debug("Loaded %s from parse cache %s", xml_filepath, cache_path)
+                    return parsed_elements
+    except FileNotFoundError:
+        pass
+    except Exception as e: # Corrupt or outdated cache entries are simply rebuilt
+        logger.debug("Ignoring unreadable parse cache %s: %s", cache_path, e)
+
+    parsed_elements = parse_eq_ui_xml(xml_filepath)
+    if parsed_elements: # Failed parses return [] and are not cached
+        temp_path = None
+        try:
+            # mkstemp creates the file with mode 0600 under a unique name
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix="eqidle_ui_", suffix=".tmp")
+            with os.fdopen(fd, 'wb') as cache_file:
+                pickle.dump((stamp, parsed_elements), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path) # Atomic, so readers never see a partial file
+        except OSError as e:
+            logger.warning("Could not write parse cache %s: %s", cache_path, e)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    return parsed_elements
+
+def load_eq_ui_files(xml_filepaths, cache_dir=None, max_workers=None):
+    """
+    Loads several UI files (with load_eq_ui_xml) in parallel worker processes.
+    Returns one list of parsed elements per path, in the same order as xml_filepaths.
+    """
+    xml_filepaths = list(xml_filepaths)
+    if len(xml_filepaths) < 2: # Not worth starting a pool
+        return [load_eq_ui_xml(xml_filepath, cache_dir) for xml_filepath in xml_filepaths]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(partial(load_eq_ui_xml, cache_dir=cache_dir), xml_filepaths))
 
+# Value converters are picked from the type of an attribute's default value. That type is
+# fixed per class, so the choice is made once per (class, attribute) and cached.
+_CONVERTER_CACHE = {}
+_PROTOTYPES = {} # class -> default-constructed instance used to read attribute defaults
+_MISSING = object()
+
+_FIELD_NAMES = {} # class -> frozenset of attribute names the parser may read or set
+
+def _field_names(eq_class):
+    """
+    Returns the attribute names of eq_class as a frozenset: its dataclass fields plus the
+    properties it defines (location, size, style flags). Used instead of hasattr()
+    so a missing attribute is a set lookup rather than a failed attribute access.
+    """
+    names = _FIELD_NAMES.get(eq_class)
+    if names is None:
+        names = {f.name for f in fields(eq_class)}
+        for klass in eq_class.__mro__:
+            names.update(name for name, value in vars(klass).items() if isinstance(value, property))
+        names = _FIELD_NAMES[eq_class] = frozenset(names)
+    return names
+
+# UI files repeat the same small numbers (coordinates, sizes, 0-255 color channels) and
+# booleans constantly; a dict hit is cheaper than running int() or lower() on them again.
+_INT_CACHE = {str(i): i for i in range(-256, 2049)}
+_BOOL_CACHE = {'true': True, 'True': True, 'TRUE': True, 'false': False, 'False': False, 'FALSE': False}
+
+def _parse_int(value):
+    result = _INT_CACHE.get(value)
+    return result if result is not None else int(value)
+
+def _parse_bool(value):
+    result = _BOOL_CACHE.get(value)
+    return result if result is not None else value.lower() == 'true'
+
+# String fields the model interns in __post_init__; the parser sets attributes after
+# construction, so it interns them itself (same limits as the model)
+_INTERNING_CONVERTERS = {
+    'screen_id': intern_ui_string,
+    'eq_type': intern_ui_string,
+    'tooltip_reference': intern_ui_string,
+    'text': partial(intern_ui_string, max_len=_INTERN_TEXT_MAX_LEN),
+}
+
+def _converter_for(eq_class, attr_name):
+    """
+    Returns the function converting XML text for eq_class.<attr_name>: bool, int and float
+    defaults get parsed, anything else is stored as a string (interned for the fields in
+    _INTERNING_CONVERTERS). Returns None if the class has no such attribute.
+    """
+    key = (eq_class, attr_name)
+    try:
+        return _CONVERTER_CACHE[key]
+    except KeyError:
+        pass
+    prototype = _PROTOTYPES.get(eq_class)
+    if prototype is None:
+        prototype = _PROTOTYPES[eq_class] = eq_class()
+    default = getattr(prototype, attr_name, _MISSING)
+    if default is _MISSING:
+        converter = None
+    elif isinstance(default, bool):
+        converter = _parse_bool
+    elif isinstance(default, int):
+        converter = _parse_int
+    elif isinstance(default, float):
+        converter = float
+    else:
+        converter = _INTERNING_CONVERTERS.get(attr_name, str)
+    _CONVERTER_CACHE[key] = converter
+    return converter
 
 def parse_element_properties(xml_element, eq_object):
     """
-    Recursively parses an XML element's attributes and child elements
-    to populate the corresponding EQ object.
+    Parses an XML element's attributes and child elements to populate the
+    corresponding EQ object, including any UI elements nested under <Pieces>/<Pages>.
+    Nested elements are handled from a work queue rather than by recursion.
     """
+    worklist = deque([(xml_element, eq_object)])
+    while worklist:
+        xml_element, eq_object = worklist.popleft()
+        _parse_one(xml_element, eq_object, worklist)
+
+def _parse_one(xml_element, eq_object, worklist):
+    """Populates eq_object from one XML element; nested UI elements are queued on worklist."""
+    # Module-level names used per attribute/child are bound to locals once per element
+    eq_class = type(eq_object)
+    field_names = _field_names(eq_class)
+    converter_for = _converter_for
+    set_attr = setattr
+
     # 1. Handle direct attributes of the XML element (e.g., <Screen ID="MyWindowID">)
     for attr_name, attr_value in xml_element.attrib.items():
         if attr_name == "ID": # Special handling for the 'ID' attribute, which maps to screen_id
-            eq_object.screen_id = attr_value
+            eq_object.screen_id = intern_ui_string(attr_value)
         elif attr_name == "name": # Sometimes 'name' is used for ScreenID or a descriptive name
-            if hasattr(eq_object, 'screen_id') and eq_object.screen_id is None: # Only if ID wasn't already set
-                eq_object.screen_id = attr_value
+            if 'screen_id' in field_names and eq_object.screen_id is None: # Only if ID wasn't already set
+                eq_object.screen_id = intern_ui_string(attr_value)
             # Also set 'item' if it matches the class hierarchy
-            if hasattr(eq_object, 'item') and eq_object.item is None:
+            if 'item' in field_names and not eq_object.item:
                 eq_object.item = attr_value
-        elif hasattr(eq_object, attr_name):
-            # Attempt to convert value based on the default type of the attribute in the EQ object
-            current_attr_value = getattr(eq_object, attr_name)
-            if isinstance(current_attr_value, bool):
-                setattr(eq_object, attr_name, attr_value.lower() == 'true')
-            elif isinstance(current_attr_value, int):
-                setattr(eq_object, attr_name, int(attr_value))
-            elif isinstance(current_attr_value, float):
-                setattr(eq_object, attr_name, float(attr_value))
-            else:
-                setattr(eq_object, attr_name, attr_value) # Default to string for others
-
-    # 2. Handle child elements of the XML element
+        else:
+            # Convert the value based on the default type of the attribute in the EQ class
+            converter = converter_for(eq_class, attr_name)
+            if converter is not None:
+                set_attr(eq_object, attr_name, converter(attr_value))
+
+    # 2. Handle child elements of the XML element: one lookup per child tag in this
+    # class's handler table, resolving (and caching) tags seen for the first time
+    tag_handlers = _CLASS_TAG_HANDLERS.get(eq_class)
+    if tag_handlers is None:
+        tag_handlers = _CLASS_TAG_HANDLERS[eq_class] = {}
+    get_handler = tag_handlers.get
     for child_xml_element in xml_element:
-        child_tag = child_xml_element.tag
-
-        # Handle basic composite types (Point, Size, RGB) that are direct children with their own attributes/children
-        if child_tag == "Location":
-            if hasattr(eq_object, 'location') and isinstance(eq_object.location, EQPoint):
-                # Check for X,Y as attributes first (less common for these tags, but possible)
-                if 'X' in child_xml_element.attrib:
-                    eq_object.location.x = int(child_xml_element.get("X"))
-                if 'Y' in child_xml_element.attrib:
-                    eq_object.location.y = int(child_xml_element.get("Y"))
-                # Then check for X,Y as child elements (more common)
-                for sub_child in child_xml_element:
-                    if sub_child.tag == "X" and sub_child.text is not None:
-                        eq_object.location.x = int(sub_child.text.strip())
-                    elif sub_child.tag == "Y" and sub_child.text is not None:
-                        eq_object.location.y = int(sub_child.text.strip())
-        elif child_tag == "Size":
-            if hasattr(eq_object, 'size') and isinstance(eq_object.size, EQSize):
-                # Check for CX,CY as attributes first
-                if 'CX' in child_xml_element.attrib:
-                    eq_object.size.cx = int(child_xml_element.get("CX"))
-                if 'CY' in child_xml_element.attrib:
-                    eq_object.size.cy = int(child_xml_element.get("CY"))
-                # Then check for CX,CY as child elements
-                for sub_child in child_xml_element:
-                    if sub_child.tag == "CX" and sub_child.text is not None:
-                        eq_object.size.cx = int(sub_child.text.strip())
-                    elif sub_child.tag == "CY" and sub_child.text is not None:
-                        eq_object.size.cy = int(sub_child.text.strip())
-        elif child_tag in ["TextColor", "BackgroundTextureTint", "DisabledColor", "MouseoverColor", "PressedColor", "FillTint", "LinesFillTint"]: # Handle all RGB types
-            target_rgb_obj = None
-            if child_tag == "TextColor" and hasattr(eq_object, 'text_color') and isinstance(eq_object.text_color, EQRGB):
-                target_rgb_obj = eq_object.text_color
-            elif child_tag == "BackgroundTextureTint" and hasattr(eq_object, 'background_texture_tint') and isinstance(eq_object.background_texture_tint, EQRGB):
-                target_rgb_obj = eq_object.background_texture_tint
-            elif child_tag == "DisabledColor" and hasattr(eq_object, 'disabled_color') and isinstance(eq_object.disabled_color, EQRGB):
-                target_rgb_obj = eq_object.disabled_color
-            elif child_tag == "MouseoverColor" and hasattr(eq_object, 'mouseover_color') and isinstance(eq_object.mouseover_color, EQRGB):
-                target_rgb_obj = eq_object.mouseover_color
-            elif child_tag == "PressedColor" and hasattr(eq_object, 'pressed_color') and isinstance(eq_object.pressed_color, EQRGB):
-                target_rgb_obj = eq_object.pressed_color
-            elif child_tag == "FillTint" and hasattr(eq_object, 'fill_tint') and isinstance(eq_object.fill_tint, EQRGB):
-                target_rgb_obj = eq_object.fill_tint
-            elif child_tag == "LinesFillTint" and hasattr(eq_object, 'lines_fill_tint') and isinstance(eq_object.lines_fill_tint, EQRGB):
-                target_rgb_obj = eq_object.lines_fill_tint
-
-            if target_rgb_obj:
-                # Check for R,G,B,Alpha as attributes first
-                if 'R' in child_xml_element.attrib: target_rgb_obj.r = int(child_xml_element.get("R"))
-                if 'G' in child_xml_element.attrib: target_rgb_obj.g = int(child_xml_element.get("G"))
-                if 'B' in child_xml_element.attrib: target_rgb_obj.b = int(child_xml_element.get("B"))
-                if 'Alpha' in child_xml_element.attrib: target_rgb_obj.alpha = int(child_xml_element.get("Alpha"))
-                # Then check for R,G,B,Alpha as child elements
-                for sub_child in child_xml_element:
-                    if sub_child.tag == "R" and sub_child.text is not None:
-                        target_rgb_obj.r = int(sub_child.text.strip())
-                    elif sub_child.tag == "G" and sub_child.text is not None:
-                        target_rgb_obj.g = int(sub_child.text.strip())
-                    elif sub_child.tag == "B" and sub_child.text is not None:
-                        target_rgb_obj.b = int(sub_child.text.strip())
-                    elif sub_child.tag == "Alpha" and sub_child.text is not None:
-                        target_rgb_obj.alpha = int(sub_child.text.strip())
-        elif child_tag == "DecalOffset": # Assuming DecalOffset is like Location
-            if hasattr(eq_object, 'decal_offset') and isinstance(eq_object.decal_offset, EQPoint):
-                if 'X' in child_xml_element.attrib: eq_object.decal_offset.x = int(child_xml_element.get("X"))
-                if 'Y' in child_xml_element.attrib: eq_object.decal_offset.y = int(child_xml_element.get("Y"))
-                for sub_child in child_xml_element:
-                    if sub_child.tag == "X" and sub_child.text is not None:
-                        eq_object.decal_offset.x = int(sub_child.text.strip())
-                    elif sub_child.tag == "Y" and sub_child.text is not None:
-                        eq_object.decal_offset.y = int(sub_child.text.strip())
-        elif child_tag == "DecalSize": # Assuming DecalSize is like Size
-            if hasattr(eq_object, 'decal_size') and isinstance(eq_object.decal_size, EQSize):
-                if 'CX' in child_xml_element.attrib: eq_object.decal_size.cx = int(child_xml_element.get("CX"))
-                if 'CY' in child_xml_element.attrib: eq_object.decal_size.cy = int(child_xml_element.get("CY"))
-                for sub_child in child_xml_element:
-                    if sub_child.tag == "CX" and sub_child.text is not None:
-                        eq_object.decal_size.cx = int(sub_child.text.strip())
-                    elif sub_child.tag == "CY" and sub_child.text is not None:
-                        eq_object.decal_size.cy = int(sub_child.text.strip())
-
-        # Handle direct text content for elements like <Text>, <ScreenID>, <EQType>
-        elif child_tag == "Text":
-            if hasattr(eq_object, 'text'):
-                eq_object.text = child_xml_element.text.strip() if child_xml_element.text else ""
-        elif child_tag == "ScreenID":
-            if hasattr(eq_object, 'screen_id'):
-                eq_object.screen_id = child_xml_element.text.strip() if child_xml_element.text else ""
-        elif child_tag == "EQType":
-            if hasattr(eq_object, 'eq_type'):
-                eq_object.eq_type = child_xml_element.text.strip() if child_xml_element.text else ""
-        elif child_tag == "Font":
-            if hasattr(eq_object, 'font') and child_xml_element.text is not None:
-                try:
-                    eq_object.font = int(child_xml_element.text.strip())
-                except ValueError:
-                    print(f"Warning: Could not convert Font value '{child_xml_element.text.strip()}' to int for {eq_object.screen_id}.")
-
-        # Handle list of child pieces (e.g., <Pieces> inside a Window/Screen or Page)
-        # These <Pieces> or <Pages> tags contain REFERENCES to other elements by their ScreenID,
-        # typically in a "TAG:ID" format (e.g., <Pieces>Button:MyButtonID</Pieces>) or just the ID.
-        elif child_tag == "Pieces": # Used by Screen, Page, LayoutBox, TileLayoutBox
-            if hasattr(eq_object, "raw_pieces_references") and isinstance(eq_object.raw_pieces_references, list):
-                # Check if the <Pieces> tag contains text (a ScreenID reference) or nested XML elements
-                if child_xml_element.text and child_xml_element.text.strip():
-                    # If it's a direct text reference (e.g., <Pieces>InvSlot23</Pieces>)
-                    referenced_id = child_xml_element.text.strip()
-                    eq_object.raw_pieces_references.append(referenced_id) # Store the ScreenID reference
-                    print(f"DEBUG: Found direct piece reference '{referenced_id}' for {eq_object.screen_id}.")
-                else:
-                    # If it contains nested XML elements (e.g., <Pieces><Button>...</Button></Pieces>)
-                    # Note: For EQ, <Pieces> usually contains REFERENCES, not nested full element definitions.
-                    # This part might need to be removed/rethought if EQ's XML truly never nests full elements under <Pieces>
-                    for piece_element in child_xml_element: # Loop through actual nested XML elements if they exist
-                        piece_eq_class = EQ_ELEMENT_CLASSES.get(piece_element.tag)
-                        if piece_eq_class:
-                            piece_obj = piece_eq_class()
-                            parse_element_properties(piece_element, piece_obj) # Recursive call
-                            eq_object.pieces.append(piece_obj) # Add actual object
-                            print(f"DEBUG: Found nested XML piece '{piece_obj.screen_id}' for {eq_object.screen_id}.")
-                        else:
-                            print(f"Warning: Unrecognized nested piece type '{piece_element.tag}' inside {xml_element.tag} (ID: {eq_object.screen_id}). Skipping.")
+        tag = child_xml_element.tag
+        handler = get_handler(tag) or _class_tag_handler(eq_class, tag, tag_handlers)
+        handler(child_xml_element, eq_object, xml_element, worklist)
+
+# Child element handlers, called as handler(child_xml_element, eq_object, parent_xml_element, worklist).
+# Handlers that find nested UI elements queue (xml_element, eq_object) pairs on worklist
+# instead of recursing.
+# Point/Size/RGB values are immutable tuples, so each handler reads the current value,
+# applies any overrides from the XML and assigns a new value back.
+
+def _read_int_pair(child_xml_element, first_name, second_name, first, second):
+    """
+    Reads a pair of ints (X/Y or CX/CY) from attributes or from child elements,
+    child elements taking precedence; values not present keep what was passed in.
+    int() tolerates the surrounding whitespace, so the text is not stripped.
+    """
+    # Check for the values as attributes first (less common for these tags, but possible)
+    attrib = child_xml_element.attrib
+    if first_name in attrib:
+        first = _parse_int(attrib[first_name])
+    if second_name in attrib:
+        second = _parse_int(attrib[second_name])
+    # Then check for them as child elements (more common)
+    first_element = child_xml_element.find(first_name)
+    if first_element is not None:
+        text = first_element.text
+        if text:
+            first = _parse_int(text)
+    second_element = child_xml_element.find(second_name)
+    if second_element is not None:
+        text = second_element.text
+        if text:
+            second = _parse_int(text)
+    return first, second
+
+# The composite handlers rely on the model's invariants: a class either has the attribute
+# (always holding the matching value type) or, being slotted, raises AttributeError.
+
+def _parse_location(child_xml_element, eq_object, parent_xml_element, worklist):
+    try:
+        x, y, cx, cy = eq_object.rect
+    except AttributeError:
+        return
+    x, y = _read_int_pair(child_xml_element, "X", "Y", x, y)
+    eq_object.rect = EQRect(x, y, cx, cy)
+
+def _parse_size(child_xml_element, eq_object, parent_xml_element, worklist):
+    try:
+        x, y, cx, cy = eq_object.rect
+    except AttributeError:
+        return
+    cx, cy = _read_int_pair(child_xml_element, "CX", "CY", cx, cy)
+    eq_object.rect = EQRect(x, y, cx, cy)
+
+# RGB child tag -> EQRGB attribute it fills
+RGB_ATTR_MAP = {
+    "TextColor": 'text_color',
+    "BackgroundTextureTint": 'background_texture_tint',
+    "DisabledColor": 'disabled_color',
+    "MouseoverColor": 'mouseover_color',
+    "PressedColor": 'pressed_color',
+    "FillTint": 'fill_tint',
+    "LinesFillTint": 'lines_fill_tint',
+}
+_RGB_CHANNEL_INDEX = {"R": 0, "G": 1, "B": 2, "Alpha": 3}
+
+def _parse_rgb(child_xml_element, eq_object, parent_xml_element, worklist):
+    target_rgb_attr = RGB_ATTR_MAP[child_xml_element.tag]
+    try:
+        channels = list(getattr(eq_object, target_rgb_attr))
+    except AttributeError:
+        return
+    # Check for R,G,B,Alpha as attributes first
+    attrib = child_xml_element.attrib
+    for channel_name, index in _RGB_CHANNEL_INDEX.items():
+        if channel_name in attrib:
+            channels[index] = _parse_int(attrib[channel_name])
+    # Then check for R,G,B,Alpha as child elements
+    get_index = _RGB_CHANNEL_INDEX.get
+    for sub_child in child_xml_element:
+        index = get_index(sub_child.tag)
+        if index is not None:
+            text = sub_child.text
+            if text is not None:
+                channels[index] = _parse_int(text)
+    setattr(eq_object, target_rgb_attr, EQRGB.of(*channels))
+
+def _parse_decal_offset(child_xml_element, eq_object, parent_xml_element, worklist): # Assuming DecalOffset is like Location
+    try:
+        x, y = eq_object.decal_offset
+    except AttributeError:
+        return
+    eq_object.decal_offset = EQPoint(*_read_int_pair(child_xml_element, "X", "Y", x, y))
+
+def _parse_decal_size(child_xml_element, eq_object, parent_xml_element, worklist): # Assuming DecalSize is like Size
+    try:
+        cx, cy = eq_object.decal_size
+    except AttributeError:
+        return
+    eq_object.decal_size = EQSize(*_read_int_pair(child_xml_element, "CX", "CY", cx, cy))
+
+# Handler factories, called once per (class, tag) when the class's handler table is built:
+# factory(eq_class) checks whether eq_class has the target attribute and returns either a
+# handler that sets it unconditionally or one that skips/reports the child.
+
+def _parse_text_of(attr_name, max_len=None):
+    """Returns a factory for handlers storing the (interned) text content of a child in eq_object.<attr_name>."""
+    def _parse_text(child_xml_element, eq_object, parent_xml_element, worklist):
+        text = child_xml_element.text
+        setattr(eq_object, attr_name, intern_ui_string(text.strip(), max_len) if text else "")
+    def _text_handler(eq_class):
+        return _parse_text if attr_name in _field_names(eq_class) else _ignore_child
+    return _text_handler
+
+def _parse_font(child_xml_element, eq_object, parent_xml_element, worklist):
+    text = child_xml_element.text
+    if text is not None:
+        try:
+            eq_object.font = _parse_int(text)
+        except ValueError:
+            logger.warning("Could not convert Font value '%s' to int for %s.", text.strip(), eq_object.screen_id)
+
+def _font_handler(eq_class):
+    return _parse_font if 'font' in _field_names(eq_class) else _ignore_child
+
+def _unsupported_reference_handler(attr_name, kind):
+    """Returns a handler reporting <Pieces>/<Pages> children of a class that cannot hold them."""
+    def _warn_unsupported(child_xml_element, eq_object, parent_xml_element, worklist):
+        logger.warning("'%s' object (ID: %s) does not support '%s'. Skipping %s: %s.",
+                       type(eq_object).__name__, eq_object.screen_id, attr_name, kind, child_xml_element.tag)
+    return _warn_unsupported
+
+# <Pieces> and <Pages> contain REFERENCES to other elements by their ScreenID,
+# typically in a "TAG:ID" format (e.g., <Pieces>Button:MyButtonID</Pieces>) or just the ID.
+
+# The reference lists are always list fields (default_factory=list), so having the field is
+# the only thing to check, once per class.
+
+def _parse_pieces(child_xml_element, eq_object, parent_xml_element, worklist): # Used by Screen, Page, LayoutBox, TileLayoutBox
+    # Check if the <Pieces> tag contains text (a ScreenID reference) or nested XML elements
+    text = child_xml_element.text
+    if text and not text.isspace():
+        # If it's a direct text reference (e.g., <Pieces>InvSlot23</Pieces>)
+        referenced_id = text.strip()
+        eq_object.raw_pieces_references.append(referenced_id) # Store the ScreenID reference
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found direct piece reference '%s' for %s.", referenced_id, eq_object.screen_id)
+    else:
+        # If it contains nested XML elements (e.g., <Pieces><Button>...</Button></Pieces>)
+        # Note: For EQ, <Pieces> usually contains REFERENCES, not nested full element definitions.
+        # This part might need to be removed/rethought if EQ's XML truly never nests full elements under <Pieces>
+        for piece_element in child_xml_element: # Loop through actual nested XML elements if they exist
+            piece_eq_class = EQ_ELEMENT_CLASSES.get(piece_element.tag)
+            if piece_eq_class:
+                piece_obj = piece_eq_class()
+                worklist.append((piece_element, piece_obj)) # Parsed after this element
+                eq_object.pieces.append(piece_obj) # Add actual object
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found nested XML piece <%s> for %s.", piece_element.tag, eq_object.screen_id)
             else:
-                print(f"Warning: '{type(eq_object).__name__}' object (ID: {eq_object.screen_id}) does not support 'raw_pieces_references' or 'raw_pieces_references' is not a list. Skipping piece: {child_xml_element.tag}.")
-        elif child_tag == "Pages": # Used by TabBox
-            if hasattr(eq_object, "raw_pages_references") and isinstance(eq_object.raw_pages_references, list):
-                if child_xml_element.text and child_xml_element.text.strip():
-                    referenced_id = child_xml_element.text.strip()
-                    eq_object.raw_pages_references.append(referenced_id)
-                    print(f"DEBUG: Found direct page reference '{referenced_id}' for {eq_object.screen_id}.")
-                else:
-                     for page_element in child_xml_element: # Loop through actual nested XML Page elements if they exist
-                        page_eq_class = EQ_ELEMENT_CLASSES.get(page_element.tag)
-                        if page_eq_class:
-                            page_obj = page_eq_class()
-                            parse_element_properties(page_element, page_obj) # Recursive call
-                            eq_object.pages.append(page_obj) # Add actual object
-                            print(f"DEBUG: Found nested XML page '{page_obj.screen_id}' for {eq_object.screen_id}.")
-                        else:
-                            print(f"Warning: Unrecognized nested page type '{page_element.tag}' inside {xml_element.tag} (ID: {eq_object.screen_id}). Skipping.")
+                logger.warning("Unrecognized nested piece type '%s' inside %s (ID: %s). Skipping.", piece_element.tag, parent_xml_element.tag, eq_object.screen_id)
+
+def _pieces_handler(eq_class):
+    if "raw_pieces_references" in _field_names(eq_class):
+        return _parse_pieces
+    return _unsupported_reference_handler("raw_pieces_references", "piece")
+
+def _parse_pages(child_xml_element, eq_object, parent_xml_element, worklist): # Used by TabBox
+    text = child_xml_element.text
+    if text and not text.isspace():
+        referenced_id = text.strip()
+        eq_object.raw_pages_references.append(referenced_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found direct page reference '%s' for %s.", referenced_id, eq_object.screen_id)
+    else:
+        for page_element in child_xml_element: # Loop through actual nested XML Page elements if they exist
+            page_eq_class = EQ_ELEMENT_CLASSES.get(page_element.tag)
+            if page_eq_class:
+                page_obj = page_eq_class()
+                worklist.append((page_element, page_obj)) # Parsed after this element
+                eq_object.pages.append(page_obj) # Add actual object
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found nested XML page <%s> for %s.", page_element.tag, eq_object.screen_id)
             else:
-                print(f"Warning: '{type(eq_object).__name__}' object (ID: {eq_object.screen_id}) does not support 'raw_pages_references' or 'raw_pages_references' is not a list. Skipping page: {child_xml_element.tag}.")
+                logger.warning("Unrecognized nested page type '%s' inside %s (ID: %s). Skipping.", page_element.tag, parent_xml_element.tag, eq_object.screen_id)
 
+def _pages_handler(eq_class):
+    if "raw_pages_references" in _field_names(eq_class):
+        return _parse_pages
+    return _unsupported_reference_handler("raw_pages_references", "page")
 
-        # Handle other simple direct properties that are children with text content
-        elif child_xml_element.text is not None and child_xml_element.text.strip():
-            prop_name = child_tag.lower()
-            if hasattr(eq_object, prop_name):
-                try:
-                    current_attr = getattr(eq_object, prop_name)
-                    if isinstance(current_attr, bool):
-                        setattr(eq_object, prop_name, child_xml_element.text.strip().lower() == 'true')
-                    elif isinstance(current_attr, int):
-                        setattr(eq_object, prop_name, int(child_xml_element.text.strip()))
-                    elif isinstance(current_attr, float):
-                        setattr(eq_object, prop_name, float(child_xml_element.text.strip()))
-                    else:
-                        setattr(eq_object, prop_name, child_xml_element.text.strip())
-                except (ValueError, AttributeError):
-                    pass
+def _xml_field_spec(eq_class, tag):
+    """
+    Returns (attribute name, converter) for a simple property child tag of eq_class, or None.
+    XML tags are CamelCase ('NoWrap', 'Style_Titlebar') and attributes snake_case
+    ('no_wrap', 'style_titlebar'), so names are matched ignoring case and underscores.
+    """
+    key = tag.lower().replace('_', '')
+    for name in _field_names(eq_class):
+        if not name.startswith('_') and name.replace('_', '') == key:
+            return (name, _converter_for(eq_class, name))
+    return None
+
+def _text_property_handler(prop_name, converter):
+    """Returns a handler for a simple direct property that is a child with text content."""
+    # int() and float() accept surrounding whitespace, so only strings and bools need stripping
+    needs_strip = converter is not _parse_int and converter is not float
+    def _parse_text_property(child_xml_element, eq_object, parent_xml_element, worklist):
+        text = child_xml_element.text
+        if text and not text.isspace():
+            try: # Free when nothing is raised; bad values are rare
+                setattr(eq_object, prop_name, converter(text.strip() if needs_strip else text))
+            except ValueError:
+                pass
+    return _parse_text_property
+
+def _ignore_child(child_xml_element, eq_object, parent_xml_element, worklist):
+    """Handler for child tags that do not apply to the element's class."""
+
+# Child tag -> handler; other tags are treated as simple properties (see _class_tag_handler)
+CHILD_TAG_HANDLERS = {
+    "Location": _parse_location,
+    "Size": _parse_size,
+    **dict.fromkeys(RGB_ATTR_MAP, _parse_rgb),
+    "DecalOffset": _parse_decal_offset,
+    "DecalSize": _parse_decal_size,
+}
+
+# Child tag -> handler factory, for handlers that depend on the element's class
+CHILD_TAG_HANDLER_FACTORIES = {
+    # Direct text content for elements like <Text>, <ScreenID>, <EQType>
+    "Text": _parse_text_of('text', _INTERN_TEXT_MAX_LEN),
+    "ScreenID": _parse_text_of('screen_id'),
+    "EQType": _parse_text_of('eq_type'),
+    "Font": _font_handler,
+    "Pieces": _pieces_handler,
+    "Pages": _pages_handler,
+}
+
+# Per-class specialization of the child dispatch: class -> {child tag: handler}, filled on
+# demand. Simple property tags get a handler with the attribute and converter already bound,
+# class-dependent tags get their factory's handler, and tags the class has no attribute for
+# get _ignore_child, so nothing is re-resolved per child.
+_CLASS_TAG_HANDLERS = {}
+
+def _class_tag_handler(eq_class, tag, tag_handlers):
+    """Resolves the handler for a <tag> child of an eq_class element and caches it in tag_handlers."""
+    if tag.__class__ is not str: # lxml comment/PI/entity nodes have a factory function as their tag
+        tag_handlers[tag] = _ignore_child
+        return _ignore_child
+    factory = CHILD_TAG_HANDLER_FACTORIES.get(tag)
+    handler = factory(eq_class) if factory is not None else CHILD_TAG_HANDLERS.get(tag)
+    if handler is None:
+        spec = _xml_field_spec(eq_class, tag)
+        handler = _ignore_child if spec is None else _text_property_handler(*spec)
+    tag_handlers[tag] = handler
+    return handler
+
+# Containers are expected to be roots or referenced explicitly, never assigned by ID prefix
+_CONTAINER_CLASSES = (EQWindow, EQPage, EQTabBox, EQTilesLayoutBox, EQVerticalLayoutBox)
+
+def _reference_id(ref_str):
+    """
+    Returns the ScreenID part of a <Pieces>/<Pages> reference. References can be like
+    "InvSlot0" or "Screen:IW_CharacterView" or "TileLayoutBox:IW_Slots".
+    """
+    _, separator, ref_id = ref_str.partition(":")
+    if not separator:
+        return ref_str
+    return ref_id.partition(":")[0] # Same as split(":")[1] if more colons follow
+
+def _collect_descendant_ids(container):
+    """Returns the screen_ids of every element reachable through container's pieces and pages."""
+    descendant_ids = set()
+    seen = {id(container)} # Guards against reference cycles
+    stack = [container]
+    while stack:
+        node = stack.pop()
+        for children in (getattr(node, 'pieces', ()), getattr(node, 'pages', ())):
+            for child in children:
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    descendant_ids.add(child.screen_id)
+                    stack.append(child)
+    return descendant_ids
 
 def assemble_ui_hierarchy(parsed_elements):
     """
@@ -276,9 +649,9 @@ def assemble_ui_hierarchy(parsed_elements):
     windows_by_id = {}
     all_elements_by_id = {}
     unassigned_elements = []
+    referencing_elements = [] # Elements with Pieces/Pages references to resolve once all IDs are known
 
-    # First pass: Populate dictionaries for quick lookup
-    # Also, identify all potential container elements (Windows, Pages, TabBoxes, LayoutBoxes)
+    # First pass: Populate dictionaries for quick lookup and note which elements reference children
     for element in parsed_elements:
         if element.screen_id: # Only add if it has a ScreenID
             all_elements_by_id[element.screen_id] = element
@@ -286,114 +659,83 @@ def assemble_ui_hierarchy(parsed_elements):
                 windows_by_id[element.screen_id] = element
         # Important: Reset pieces/pages to empty lists if they contain string references from initial parsing
         # We want to populate them with actual objects here
-        if hasattr(element, 'pieces') and all(isinstance(p, str) for p in element.pieces):
+        # One getattr with a sentinel reads each list once, instead of hasattr() plus a second read
+        pieces = getattr(element, 'pieces', _MISSING)
+        if pieces is not _MISSING and all(type(p) is str for p in pieces):
             # This check ensures we only clear and re-populate if they were raw string references
             # from the initial parse_element_properties step.
-            element.raw_pieces_references = list(element.pieces) # Store a copy of raw references
+            element.raw_pieces_references = list(pieces) # Store a copy of raw references
             element.pieces = [] # Reset for actual objects
-        if hasattr(element, 'pages') and all(isinstance(p, str) for p in element.pages):
-            element.raw_pages_references = list(element.pages) # Store a copy of raw references
+        pages = getattr(element, 'pages', _MISSING)
+        if pages is not _MISSING and all(type(p) is str for p in pages):
+            element.raw_pages_references = list(pages) # Store a copy of raw references
             element.pages = [] # Reset for actual objects
+        if element.screen_id and (getattr(element, 'raw_pieces_references', None) or getattr(element, 'raw_pages_references', None)):
+            referencing_elements.append(element)
 
-
-    # Second pass: Assign children to parents based on references
+    # Second pass: Assign children to parents based on references (needs every ID, as references may point forward)
     # This pass will correctly populate 'pieces' and 'pages' lists with actual objects
-    for element_id, element_obj in all_elements_by_id.items():
-        # Handle elements that explicitly define children by reference (e.g., Window, Page, TabBox, LayoutBox)
-        if hasattr(element_obj, 'raw_pieces_references') and element_obj.raw_pieces_references:
-            for ref_str in element_obj.raw_pieces_references:
-                # References can be like "InvSlot0" or "Screen:IW_CharacterView" or "TileLayoutBox:IW_Slots"
-                ref_id = ref_str
-                if ":" in ref_str:
-                    parts = ref_str.split(":")
-                    if len(parts) > 1: # Ensure there is an ID part
-                        ref_id = parts[1] 
-
-                child_obj = all_elements_by_id.get(ref_id)
-                if child_obj:
-                    element_obj.pieces.append(child_obj)
-                    child_obj.parent_id = element_obj.screen_id
-                else:
-                    print(f"Warning: Could not find referenced child '{ref_str}' for parent '{element_id}'. Skipping.")
-        
-        if hasattr(element_obj, 'raw_pages_references') and element_obj.raw_pages_references:
-            for ref_str in element_obj.raw_pages_references:
-                ref_id = ref_str
-                if ":" in ref_str:
-                    parts = ref_str.split(":")
-                    if len(parts) > 1:
-                        ref_id = parts[1]
-
-                child_obj = all_elements_by_id.get(ref_id)
-                if child_obj:
-                    element_obj.pages.append(child_obj)
-                    child_obj.parent_id = element_obj.screen_id
-                else:
-                    print(f"Warning: Could not find referenced page '{ref_str}' for parent '{element_id}'. Skipping.")
+    for element_obj in referencing_elements:
+        element_id = element_obj.screen_id
+        if all_elements_by_id[element_id] is not element_obj: # Shadowed by a later element with the same ID
+            continue
+        for ref_str in getattr(element_obj, 'raw_pieces_references', ()):
+            child_obj = all_elements_by_id.get(_reference_id(ref_str))
+            if child_obj:
+                element_obj.pieces.append(child_obj)
+                child_obj.parent_id = element_id
+            else:
+                logger.warning("Could not find referenced child '%s' for parent '%s'. Skipping.", ref_str, element_id)
+        for ref_str in getattr(element_obj, 'raw_pages_references', ()):
+            child_obj = all_elements_by_id.get(_reference_id(ref_str))
+            if child_obj:
+                element_obj.pages.append(child_obj)
+                child_obj.parent_id = element_id
+            else:
+                logger.warning("Could not find referenced page '%s' for parent '%s'. Skipping.", ref_str, element_id)
 
-    # Third pass: Assign remaining unassigned elements to the main InventoryWindow based on prefix (if applicable)
-    # This is a fallback for elements not explicitly referenced in Pieces/Pages but belong to the main window
+    # Final pass: Elements still without a parent either fall back to the main InventoryWindow
+    # (IDs starting with "IW_" that are not already somewhere under it) or are truly unassigned.
+    # Top-level containers (Windows, Pages, TabBoxes, LayoutBoxes) are expected to be roots.
     main_inventory_window = windows_by_id.get("InventoryWindow") # Get the main window after its children were populated
-    if main_inventory_window: # Only proceed if the main inventory window itself was parsed
-        for element_id, element_obj in all_elements_by_id.items():
-            # If element is not a Window/Page/TabBox/LayoutBox itself AND has no parent yet
-            # And its ID starts with "IW_" (common for InventoryWindow children)
-            if not isinstance(element_obj, (EQWindow, EQPage, EQTabBox, EQTilesLayoutBox, EQVerticalLayoutBox)) and \
-               not element_obj.parent_id and \
-               element_id.startswith("IW_"):
-                
-                # Check if it's already a direct child of a Page or LayoutBox within InventoryWindow
-                # We need to be careful not to re-assign if it's already part of a sub-container
-                is_already_child_of_subcontainer = False
-                # Check direct pieces of main_inventory_window
-                if hasattr(main_inventory_window, 'pieces'):
-                    for piece in main_inventory_window.pieces:
-                        if hasattr(piece, 'screen_id') and piece.screen_id == element_id:
-                            is_already_child_of_subcontainer = True
-                            break
-                        # Also check pieces within nested containers like Pages and LayoutBoxes
-                        if hasattr(piece, 'pieces') and any(hasattr(sub_piece, 'screen_id') and sub_piece.screen_id == element_id for sub_piece in piece.pieces):
-                            is_already_child_of_subcontainer = True
-                            break
-                        if hasattr(piece, 'pages') and any(hasattr(page_in_piece, 'screen_id') and page_in_piece.screen_id == element_id for page_in_piece in piece.pages):
-                            is_already_child_of_subcontainer = True
-                            break
-                # Check direct pages of main_inventory_window
-                if hasattr(main_inventory_window, 'pages') and not is_already_child_of_subcontainer: # Only check if not already found
-                    for page in main_inventory_window.pages:
-                        if hasattr(page, 'screen_id') and page.screen_id == element_id:
-                            is_already_child_of_subcontainer = True
-                            break
-                        if hasattr(page, 'pieces') and any(hasattr(piece_in_page, 'screen_id') and piece_in_page.screen_id == element_id for piece_in_page in page.pieces):
-                            is_already_child_of_subcontainer = True
-                            break
-                        if hasattr(page, 'pages') and any(hasattr(page_in_page, 'screen_id') and page_in_page.screen_id == element_id for page_in_piece in page.pages):
-                            is_already_child_of_subcontainer = True
-                            break
-
-
-                if not is_already_child_of_subcontainer:
-                    main_inventory_window.pieces.append(element_obj)
-                    element_obj.parent_id = main_inventory_window.screen_id
-
-    # Fourth pass: Identify truly unassigned elements
+    # Everything already under the main window (directly or inside a Page/LayoutBox) must not be re-assigned
+    assigned_ids = _collect_descendant_ids(main_inventory_window) if main_inventory_window else ()
     for element in parsed_elements:
-        # An element is unassigned if it has no parent AND it's not a top-level container that we expect to be root (like InventoryWindow, Pages, TabBoxes, LayoutBoxes)
-        if not element.parent_id and element.screen_id and \
-           not isinstance(element, (EQWindow, EQPage, EQTabBox, EQTilesLayoutBox, EQVerticalLayoutBox)):
+        element_id = element.screen_id
+        if element.parent_id or not element_id or isinstance(element, _CONTAINER_CLASSES):
+            continue
+        if main_inventory_window and element_id.startswith("IW_") and element_id not in assigned_ids and \
+           all_elements_by_id[element_id] is element:
+            main_inventory_window.pieces.append(element)
+            element.parent_id = main_inventory_window.screen_id
+        else:
             unassigned_elements.append(element)
 
     return windows_by_id, all_elements_by_id, unassigned_elements
 
+def assemble_ui_files(xml_filepaths, cache_dir=None, max_workers=None):
+    """
+    Loads several UI files in parallel (see load_eq_ui_files) and assembles all of their
+    elements as one set, so references between files resolve too.
+    Returns the same (main_windows, all_elements, unassigned_elements) as assemble_ui_hierarchy.
+    """
+    parsed_elements = []
+    for file_elements in load_eq_ui_files(xml_filepaths, cache_dir, max_workers):
+        parsed_elements.extend(file_elements)
+    return assemble_ui_hierarchy(parsed_elements)
+
 
 if __name__ == "__main__":
+    # Show the parser's debug/warning messages when run as a script
+    logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s")
+
     # Use EQUI_Inventory.xml as planned
     # This path must be EXACTLY correct for your system!
     inventory_window_path = "F:/THJ/uifiles/default/EQUI_Inventory.xml" 
 
     try:
         # Step 1: Parse all elements as a flat list
-        parsed_ui_elements = parse_eq_ui_xml(inventory_window_path)
+        parsed_ui_elements = load_eq_ui_xml(inventory_window_path)
 
         print("\n--- Raw Parsed Top-Level Elements (before assembly) ---")
         if parsed_ui_elements:
@@ -434,7 +776,5 @@ if __name__ == "__main__":
         else:
             print("\nAll parsed elements were assigned to a parent or are top-level containers.")
 
-    except Exception as e:
-        print(f"\nAn unhandled error occurred during script execution: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("An unhandled error occurred during script execution.")